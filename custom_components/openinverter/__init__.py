@@ -4,6 +4,7 @@ import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN, PLATFORMS
 from .coordinator import OpenInverterDataUpdateCoordinator
@@ -21,10 +22,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Attempt to load saved data (persistence)
     await coordinator.async_load_saved_data()
+    # Persisted data with the same-day/new-day cache rules applied (stale real-time values zeroed)
+    seed_data = coordinator.fallback_data(dt_util.now())
 
-    # Fetch initial data so we have it when platforms are set up.
-    # This will also raise ConfigEntryNotReady if the first fetch fails.
-    await coordinator.async_config_entry_first_refresh()
+    if seed_data is not None:
+        # Seed the sensors from the persisted data so setup does not wait on the network;
+        # the first real fetch runs in the background once the platforms are set up.
+        coordinator.async_set_updated_data(seed_data)
+    else:
+        # Fetch initial data so we have it when platforms are set up.
+        # This will also raise ConfigEntryNotReady if the first fetch fails.
+        await coordinator.async_config_entry_first_refresh()
 
     # Store the coordinator instance in hass.data for platforms to access
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -33,6 +41,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # The coordinator is passed implicitly via hass.data
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if seed_data is not None:
+        # Replace the seeded values with live data right away, without blocking setup
+        entry.async_create_background_task(hass, coordinator.async_refresh(), "openinverter_first_refresh")
+
     _LOGGER.info("Finished setting up Open Inverter Gateway entry %s", entry.entry_id)
 
     # Return True to indicate successful setup
@@ -1,7 +1,9 @@
 """Config flow for My Open Inverter Gateway integration."""
 
 import asyncio
+import ipaddress
 import logging
+import re
 from typing import Any
 
 import aiohttp
@@ -12,6 +14,7 @@ from homeassistant.const import CONF_IP_ADDRESS
 from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
 
 from .const import (
     API_ENDPOINT_PATH,
@@ -22,6 +25,12 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Accepted shape for a hostname (or IPv4 address) with an optional port in the range 1-65535
+_HOST_RE = re.compile(
+    r"^[A-Za-z0-9.-]{1,253}"
+    r"(:(6553[0-5]|655[0-2]\d|65[0-4]\d{2}|6[0-4]\d{3}|[1-5]\d{4}|[1-9]\d{0,3}))?$"
+)
+
 # Schema for the user configuration step
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
@@ -37,35 +46,44 @@ async def validate_input(hass, data: dict) -> dict[str, Any]:
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
-    session = async_get_clientsession(hass)
     ip_address = data[CONF_IP_ADDRESS]
+    # Reject malformed input before spending a network round-trip (and timeout) on it
+    try:
+        # IPv6 literals would need brackets in the http://{ip_address}/status URLs built here and by the coordinator
+        valid = ipaddress.ip_address(ip_address).version == 4
+    except ValueError:
+        # Allow hostnames, optionally with a port
+        valid = _HOST_RE.fullmatch(ip_address) is not None
+    if not valid:
+        _LOGGER.error(f"Invalid host: {ip_address}")
+        raise ValueError("invalid_host")
+    # Always use HA's shared session: a coordinator's single-connection pool may be busy polling
+    session = async_get_clientsession(hass)
     # Construct the full URL to the JSON endpoint
     url = f"http://{ip_address}{API_ENDPOINT_PATH}"
 
     try:
-        # Attempt to connect and fetch data from the endpoint
-        async with asyncio.timeout(10):  # 10-second timeout for the request
-            async with session.get(url) as response:
-                if response.status == 200:
-                    # Optionally, try to parse JSON to ensure it's valid
-                    try:
-                        await response.json()
-                        # Connection successful and JSON is valid
-                        # Return info used to create the config entry title
-                        return {"title": f"Open Inverter ({ip_address})"}
-                    except Exception as json_err:
-                        _LOGGER.error(f"Failed to parse JSON from {url}: {json_err}")
-                        raise ValueError("invalid_json") from json_err
-                else:
-                    _LOGGER.error(f"Connection failed to {url}: Status {response.status}")
-                    raise ValueError("cannot_connect")
-
-    except (TimeoutError, aiohttp.ClientConnectorError) as conn_err:
+        # Attempt to connect and fetch data from the endpoint (10-second timeout for the request)
+        async with asyncio.timeout(10), session.get(url) as response:
+            response.raise_for_status()
+            body = await response.read()
+    except aiohttp.ClientResponseError as resp_err:
+        _LOGGER.error(f"Connection failed to {url}: Status {resp_err.status}")
+        raise ValueError("cannot_connect") from resp_err
+    except (TimeoutError, aiohttp.ClientError) as conn_err:
         _LOGGER.error(f"Connection failed to {url}: {conn_err}")
         raise ValueError("cannot_connect") from conn_err
-    except Exception as err:
-        _LOGGER.error(f"Unexpected error validating connection to {url}: {err}")
-        raise ValueError("unknown") from err
+
+    # Ensure the endpoint returned valid JSON
+    try:
+        json_loads(body)
+    except JSON_DECODE_EXCEPTIONS as json_err:
+        _LOGGER.error(f"Failed to parse JSON from {url}: {json_err}")
+        raise ValueError("invalid_json") from json_err
+
+    # Connection successful and JSON is valid
+    # Return info used to create the config entry title
+    return {"title": f"Open Inverter ({ip_address})"}
 
 
 class OpenInverterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -90,6 +108,8 @@ class OpenInverterConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "cannot_connect"
             elif reason == "invalid_json":
                 errors["base"] = "invalid_json"
+            elif reason == "invalid_host":
+                errors["base"] = "invalid_host"
             else:
                 errors["base"] = "unknown_validation_error"
         except Exception as exc:
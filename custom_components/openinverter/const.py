@@ -13,6 +13,10 @@ CONF_SCAN_INTERVAL = "scan_interval"  # User-defined refresh frequency in second
 
 # Default values
 DEFAULT_SCAN_INTERVAL = 60  # Default polling interval in seconds (e.g., 1 minute)
+BACKOFF_MAX = 300  # Upper bound in seconds for the update interval while the gateway is unreachable
+BACKOFF_JITTER = 0.1  # Fraction of random extra delay added to each backoff interval
+OPTIONS_UPDATE_COOLDOWN = 0.5  # Seconds to coalesce rapid options changes before applying them
+DNS_CACHE_TTL = 300  # Seconds to cache the resolved address when a hostname is configured
 
 # Platforms to support (currently only sensor)
 PLATFORMS = ["sensor"]
@@ -22,12 +26,32 @@ PLATFORMS = ["sensor"]
 API_ENDPOINT_PATH = "/status"
 
 # Sensors that should be cached during the day and reset to 0 at midnight
-DAILY_SENSORS = [
-    "TodayGenerateEnergy",
-    "PV1EnergyToday",
-    "PV2EnergyToday",
-    "EnergyToUserToday",
-    "EnergyToGridToday",
-    "DischargeEnergyToday",
-    "ChargeEnergyToday",
-]
+DAILY_SENSORS: frozenset[str] = frozenset(
+    {
+        "TodayGenerateEnergy",
+        "PV1EnergyToday",
+        "PV2EnergyToday",
+        "EnergyToUserToday",
+        "EnergyToGridToday",
+        "DischargeEnergyToday",
+        "ChargeEnergyToday",
+    }
+)
+
+# Keys carried over from the cache in every fallback payload: the device identity (used for the
+# device name and MAC) and lifetime counters, which would read as a meter reset if zeroed
+PERSISTENT_KEYS: frozenset[str] = frozenset(
+    {
+        "Hostname",
+        "Mac",
+        "TotalGenerateEnergy",
+        "TWorkTimeTotal",
+        "PV1EnergyTotal",
+        "PV2EnergyTotal",
+        "PVEnergyTotal",
+        "EnergyToUserTotal",
+        "EnergyToGridTotal",
+        "DischargeEnergyTotal",
+        "ChargeEnergyTotal",
+    }
+)
@@ -1,26 +1,64 @@
 """DataUpdateCoordinator for the My Open Inverter Gateway integration."""
 
 import logging
-from datetime import timedelta
+import random
+from datetime import datetime, timedelta
+from functools import cached_property
+from typing import Any
 
 import aiohttp
 import async_timeout
+from aiohttp import hdrs
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_IP_ADDRESS
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import CONF_IP_ADDRESS, EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
+from yarl import URL
 
-from .const import API_ENDPOINT_PATH, CONF_SCAN_INTERVAL, DAILY_SENSORS, DOMAIN, STORAGE_KEY, STORAGE_VERSION
+from .const import (
+    API_ENDPOINT_PATH,
+    BACKOFF_JITTER,
+    BACKOFF_MAX,
+    CONF_SCAN_INTERVAL,
+    DAILY_SENSORS,
+    DNS_CACHE_TTL,
+    DOMAIN,
+    OPTIONS_UPDATE_COOLDOWN,
+    PERSISTENT_KEYS,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _async_create_session() -> aiohttp.ClientSession:
+    """Create a session that keeps a single connection to the inverter alive between polls."""
+    connector = aiohttp.TCPConnector(
+        limit=1,
+        limit_per_host=1,
+        force_close=False,
+        keepalive_timeout=300,
+        # Resolve a configured hostname once per TTL instead of on every poll (bare IPs skip lookup)
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    # Identify as Home Assistant, like the sessions from homeassistant.helpers.aiohttp_client
+    return aiohttp.ClientSession(connector=connector, headers={hdrs.USER_AGENT: SERVER_SOFTWARE})
+
+
 class OpenInverterDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the Open Inverter Gateway."""
 
+    # Seconds to coalesce storage writes for before flushing to disk
+    SAVE_DELAY = 60
+
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
         """Initialize the coordinator."""
         self.hass = hass
@@ -28,12 +66,18 @@ class OpenInverterDataUpdateCoordinator(DataUpdateCoordinator):
         self.ip_address = entry.data[CONF_IP_ADDRESS]
         # Construct the full URL to the JSON endpoint
         self.api_url = f"http://{self.ip_address}{API_ENDPOINT_PATH}"
-        self.session = async_get_clientsession(hass)
+        # Pre-built once so aiohttp skips URL parsing and header construction on every poll
+        self._request_url = URL(self.api_url, encoded=True)
+        self._request_headers = {"Connection": "keep-alive", "Accept": "application/json"}
+        self.session = _async_create_session()
+        # Close the session when HA stops, not only when the entry is unloaded
+        entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_close_session))
 
         # Determine the update interval from options or initial config
         update_interval_seconds = entry.options.get(CONF_SCAN_INTERVAL, entry.data.get(CONF_SCAN_INTERVAL))
         update_interval = timedelta(seconds=update_interval_seconds)
         self._base_update_interval = update_interval
+        self._failure_count = 0
 
         _LOGGER.debug(
             "Initializing OpenInverter coordinator for %s with update interval %s",
@@ -48,15 +92,24 @@ class OpenInverterDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=update_interval,
         )
 
-        self._last_valid_data = None
-        self._last_valid_time = None
-
-        # Initialize storage
-        self._store = Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry.entry_id}")
+        self._last_valid_data: dict[str, Any] | None = None
+        self._last_valid_time: datetime | None = None
+        # Fallback payloads derived from the cached key set, rebuilt only when the keys change
+        self._zero_template: dict[str, Any] = {}
+        self._daily_keys: tuple[str, ...] = ()
+        self._persistent_keys: tuple[str, ...] = ()
 
         # Listen for changes to the options flow
+        self._options_debouncer = Debouncer(
+            hass, _LOGGER, cooldown=OPTIONS_UPDATE_COOLDOWN, immediate=False, function=self._apply_options
+        )
         self._unsub_options_update_listener = self.entry.add_update_listener(self._handle_options_update)
 
+    @cached_property
+    def _store(self) -> Store:
+        """Return the storage for this entry, created on first use."""
+        return Store(self.hass, STORAGE_VERSION, f"{STORAGE_KEY}.{self.entry.entry_id}")
+
     async def async_load_saved_data(self) -> None:
         """Load saved data from storage."""
         try:
@@ -75,9 +128,76 @@ class OpenInverterDataUpdateCoordinator(DataUpdateCoordinator):
         except Exception as err:
             _LOGGER.warning("Error loading saved data for %s: %s", self.ip_address, err)
 
+    def fallback_data(self, now: datetime) -> dict[str, Any] | None:
+        """Return the data to publish when no fresh data is available, or None without a cache."""
+        data = self._last_valid_data
+        if not data:
+            return None
+
+        self._ensure_fallback_templates(data)
+
+        # Identity and lifetime counters are kept in both scenarios
+        cached_data = self._zero_template.copy()
+        for key in self._persistent_keys:
+            cached_data[key] = data[key]
+
+        # Scenario 1: Same day -> Cache daily sensors too, zero others
+        if self._last_valid_time and now.date() == self._last_valid_time.date():
+            _LOGGER.debug("Using cached data for DAILY sensors of %s, resetting others.", self.ip_address)
+
+            # Keep daily values, zero out real-time values (Power, Voltage, etc.)
+            for key in self._daily_keys:
+                cached_data[key] = data[key]
+
+            return cached_data
+
+        # Scenario 2: New day (or no timestamp) -> Reset everything else to 0
+        _LOGGER.debug(
+            "New day detected (or cache invalid) for %s, resetting daily and real-time values to 0.",
+            self.ip_address,
+        )
+        return cached_data
+
+    @cached_property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info shared by every entity of this gateway."""
+        device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.entry.entry_id)},
+            # Use the Hostname from the data for the device name if available
+            name=self.data.get("Hostname", self.entry.title),
+            manufacturer="Growatt",
+            configuration_url=f"http://{self.ip_address}",
+        )
+        if mac := self.data.get("Mac"):
+            device_info["connections"] = {("mac", str(mac))}
+        return device_info
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist to storage."""
+        timestamp = self._last_valid_time
+        return {
+            "data": self._last_valid_data,
+            "timestamp": timestamp.isoformat() if timestamp else None,
+        }
+
+    def _ensure_fallback_templates(self, data: dict[str, Any]) -> None:
+        """Rebuild the fallback templates if the cached data's key set has changed."""
+        if self._zero_template.keys() != data.keys():
+            self._zero_template = dict.fromkeys(data, 0)
+            self._daily_keys = tuple(data.keys() & DAILY_SENSORS)
+            self._persistent_keys = tuple(data.keys() & PERSISTENT_KEYS)
+
+    async def _async_close_session(self, event: Event) -> None:
+        """Close the HTTP session on Home Assistant shutdown."""
+        await self.session.close()
+
     async def _handle_options_update(self, hass: HomeAssistant, entry: ConfigEntry):
-        """Handle options update."""
-        new_interval_seconds = entry.options[CONF_SCAN_INTERVAL]
+        """Handle options update, coalescing bursts of changes."""
+        await self._options_debouncer.async_call()
+
+    async def _apply_options(self) -> None:
+        """Apply the current options to the coordinator."""
+        new_interval_seconds = self.entry.options[CONF_SCAN_INTERVAL]
         new_interval = timedelta(seconds=new_interval_seconds)
         _LOGGER.debug("Updating polling interval for %s to %s", self.ip_address, new_interval)
         self.update_interval = new_interval
@@ -89,12 +209,18 @@ class OpenInverterDataUpdateCoordinator(DataUpdateCoordinator):
         try:
             # Use async_timeout for the request
             async with async_timeout.timeout(15):
-                response = await self.session.get(self.api_url)
-                response.raise_for_status()
-                data = await response.json()
+                # The context manager releases the connection (the pool's only slot) on every path
+                async with self.session.get(self._request_url, headers=self._request_headers) as response:
+                    response.raise_for_status()
+                    body = await response.read()
 
-                # Basic validation
-                if not isinstance(data, dict):
+                try:
+                    data = json_loads(body)
+                except JSON_DECODE_EXCEPTIONS as err:
+                    raise UpdateFailed(f"Invalid JSON received: {err}") from err
+
+                # Basic validation (exact type check first, isinstance only as a fallback for subclasses)
+                if type(data) is not dict and not isinstance(data, dict):
                     err_msg = f"Invalid data format received (not a dictionary): {data}"
                     _LOGGER.error(err_msg)
                     raise UpdateFailed(err_msg)
@@ -103,18 +229,11 @@ class OpenInverterDataUpdateCoordinator(DataUpdateCoordinator):
                 self._last_valid_data = data
                 self._last_valid_time = dt_util.now()
 
-                # Persist data
-                try:
-                    await self._store.async_save(
-                        {
-                            "data": self._last_valid_data,
-                            "timestamp": self._last_valid_time.isoformat(),
-                        }
-                    )
-                except Exception as err:
-                    _LOGGER.warning("Error saving data for %s: %s", self.ip_address, err)
+                # Persist data (debounced, the store flushes after SAVE_DELAY)
+                self._store.async_delay_save(self._data_to_save, self.SAVE_DELAY)
 
                 # Reset backoff if needed
+                self._failure_count = 0
                 if self.update_interval != self._base_update_interval:
                     _LOGGER.info(
                         "Connection to %s restored. Resetting update interval to %s",
@@ -123,53 +242,32 @@ class OpenInverterDataUpdateCoordinator(DataUpdateCoordinator):
                     )
                     self.update_interval = self._base_update_interval
 
-                _LOGGER.debug("Data received from %s: %s", self.api_url, data)
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("Data received from %s: %s", self.api_url, data)
                 return data
 
-        except (TimeoutError, aiohttp.ClientError, Exception) as err:
+        except (TimeoutError, aiohttp.ClientError, ValueError, UpdateFailed) as err:
             now = dt_util.now()
 
-            # Exponential backoff
-            if self.update_interval and self.update_interval < timedelta(minutes=5):
-                new_interval = self.update_interval * 2
-                if new_interval > timedelta(minutes=5):
-                    new_interval = timedelta(minutes=5)
-
-                _LOGGER.warning(
-                    "Error fetching data from %s: %s. Increasing update interval to %s",
-                    self.api_url,
-                    err,
-                    new_interval,
-                )
-                self.update_interval = new_interval
-
-            # Scenario 1: Same day failure -> Cache ONLY daily sensors, zero others
-            if self._last_valid_data and self._last_valid_time and now.date() == self._last_valid_time.date():
-                _LOGGER.warning(
-                    "Error fetching data from %s (%s). Using cached data for DAILY sensors, resetting others.",
-                    self.api_url,
-                    err,
-                )
+            # Exponential backoff with jitter, capped at BACKOFF_MAX but never below the base interval
+            self._failure_count += 1
+            base_seconds = self._base_update_interval.total_seconds()
+            # Clamp the exponent so long outages cannot overflow the float multiplication
+            delay = min(BACKOFF_MAX, base_seconds * 2 ** min(self._failure_count, 16))
+            delay = max(delay, base_seconds)
+            new_interval = timedelta(seconds=delay * (1 + random.uniform(0, BACKOFF_JITTER)))
 
-                cached_data = {}
-                for key, value in self._last_valid_data.items():
-                    if key in DAILY_SENSORS:
-                        cached_data[key] = value  # Keep daily values
-                    else:
-                        cached_data[key] = 0  # Zero out real-time values (Power, Voltage, etc.)
-
-                return cached_data
-
-            # Scenario 2: New day (or no cache) -> Reset EVERYTHING to 0
-            elif self._last_valid_data:
-                _LOGGER.warning(
-                    "Error fetching data from %s (%s). New day detected (or cache invalid), resetting ALL values to 0.",
-                    self.api_url,
-                    err,
-                )
-                # Create a dictionary with all 0s
-                zero_data = {k: 0 for k in self._last_valid_data}
-                return zero_data
+            _LOGGER.warning(
+                "Error fetching data from %s: %s. Setting update interval to %s",
+                self.api_url,
+                err,
+                new_interval,
+            )
+            self.update_interval = new_interval
+
+            if (fallback_data := self.fallback_data(now)) is not None:
+                _LOGGER.warning("Error fetching data from %s (%s). Using cached fallback data.", self.api_url, err)
+                return fallback_data
 
             # If no cache at all, raise the error (sensors become unavailable)
             _LOGGER.warning(
@@ -183,4 +281,14 @@ class OpenInverterDataUpdateCoordinator(DataUpdateCoordinator):
         """Clean up listeners when the coordinator is shut down."""
         if self._unsub_options_update_listener:
             self._unsub_options_update_listener()
+        self._options_debouncer.async_cancel()
+
+        # Flush any pending delayed save before going away
+        if self._last_valid_data and self._last_valid_time:
+            try:
+                await self._store.async_save(self._data_to_save())
+            except Exception as err:
+                _LOGGER.warning("Error saving data for %s: %s", self.ip_address, err)
+
+        await self.session.close()
         await super().async_shutdown()
@@ -1,6 +1,8 @@
 """Sensor platform for My Open Inverter Gateway."""
 
 import logging
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -34,11 +36,16 @@ from .coordinator import OpenInverterDataUpdateCoordinator  # Import the coordin
 
 _LOGGER = logging.getLogger(__name__)
 
+# State classes whose values must be reported as numbers
+_NUMERIC_STATE_CLASSES = frozenset(
+    {SensorStateClass.MEASUREMENT, SensorStateClass.TOTAL, SensorStateClass.TOTAL_INCREASING}
+)
+
 # ==========================================================================
 # IMPORTANT: Sensor definitions based on the provided Growatt JSON sample.
 # ==========================================================================
 # Adapt, remove, or comment out sensors as needed.
-SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
+_SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
     "InverterStatus": SensorEntityDescription(
         key="InverterStatus",
         name="Inverter Status Code",  # Consider creating a template sensor later to map codes to names
@@ -361,6 +368,9 @@ SENSOR_DESCRIPTIONS: dict[str, SensorEntityDescription] = {
     ),
     # Add other Heap values if desired (MaxAlloc, MinFree, Fragmentation)
 }
+# Read-only view so the definitions cannot be mutated at runtime, plus the key set for setup intersection
+SENSOR_DESCRIPTIONS: Mapping[str, SensorEntityDescription] = MappingProxyType(_SENSOR_DESCRIPTIONS)
+_SENSOR_KEYS = frozenset(SENSOR_DESCRIPTIONS)
 # ==========================================================================
 
 
@@ -373,16 +383,23 @@ async def async_setup_entry(
     coordinator: OpenInverterDataUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id]
 
     entities_to_add = []
-    if coordinator.data:
-        # Use the Hostname from the data for the device name if available
-        device_name = coordinator.data.get("Hostname", config_entry.title)
+    data = coordinator.data
+    if data:
+        # Built once per config entry and shared by every sensor
+        device_info = coordinator.device_info
+
+        # Only create the sensors the device actually reports, in definition order
+        present = _SENSOR_KEYS & data.keys()
+        entities_to_add = [
+            OpenInverterSensor(coordinator, config_entry, description, device_info)
+            for json_key, description in SENSOR_DESCRIPTIONS.items()
+            if json_key in present
+        ]
 
-        for json_key, description in SENSOR_DESCRIPTIONS.items():
-            if json_key in coordinator.data:
-                _LOGGER.debug("Creating sensor for key: %s", json_key)
-                entities_to_add.append(OpenInverterSensor(coordinator, config_entry, description, device_name))
-            else:
-                _LOGGER.debug(  # Changed to debug level, less alarming if optional keys are missing
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Creating sensors for keys: %s", sorted(present))
+            for json_key in _SENSOR_KEYS - present:
+                _LOGGER.debug(  # Debug level, less alarming if optional keys are missing
                     "JSON key '%s' defined in SENSOR_DESCRIPTIONS not found in data from %s. Skipping sensor.",
                     json_key,
                     coordinator.ip_address,
@@ -412,35 +429,35 @@ class OpenInverterSensor(CoordinatorEntity[OpenInverterDataUpdateCoordinator], S
         coordinator: OpenInverterDataUpdateCoordinator,
         config_entry: ConfigEntry,
         description: SensorEntityDescription,
-        device_name: str,  # Pass device name
+        device_info: DeviceInfo,
     ):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self.entity_description = description
         self._config_entry = config_entry
+        # The description is fixed per entity, so resolve what native_value needs once
+        self._json_key = description.key
+        # Conversion applied to non-numeric raw values, None passes the value through unchanged
+        self._convert: Callable[[Any], float] | None = (
+            float if description.state_class in _NUMERIC_STATE_CLASSES else None
+        )
 
         self._attr_unique_id = f"{config_entry.entry_id}_{description.key}"
 
-        # Use the fetched Hostname (or fallback) for the device name
-        device_info_args = {
-            "identifiers": {(DOMAIN, config_entry.entry_id)},
-            "name": device_name,
-            "manufacturer": "Growatt",
-            "configuration_url": f"http://{coordinator.ip_address}",
-        }
-        if mac := coordinator.data.get("Mac"):
-            device_info_args["connections"] = {("mac", str(mac))}
-
-        self._attr_device_info = DeviceInfo(**device_info_args)
+        self._attr_device_info = device_info
 
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
-        json_key = self.entity_description.key
-        value = self.coordinator.data.get(json_key)
+        json_key = self._json_key
+        # The key is almost always present, so index directly rather than .get()
+        try:
+            value = self.coordinator.data[json_key]
+        except (KeyError, TypeError):
+            return None  # Don't process if value (or data) is missing
 
         if value is None:
-            return None  # Don't process if value is missing
+            return None
 
         # Handle specific cases or conversions if needed
         # Example: Convert TWorkTimeTotal if it's in a weird unit
@@ -452,14 +469,12 @@ class OpenInverterSensor(CoordinatorEntity[OpenInverterDataUpdateCoordinator], S
         #        return None # Handle conversion error
 
         # Ensure numeric types for measurement sensors
-        if (
-            self.entity_description.state_class == SensorStateClass.MEASUREMENT
-            or self.entity_description.state_class == SensorStateClass.TOTAL
-            or self.entity_description.state_class == SensorStateClass.TOTAL_INCREASING
-        ):
+        convert = self._convert
+        # JSON numbers already arrive as int/float, only strings need converting
+        if convert is not None and value.__class__ is not float and value.__class__ is not int:
             try:
                 # Attempt conversion to float
-                return float(value)
+                return convert(value)
             except (ValueError, TypeError):
                 _LOGGER.warning(
                     "Could not convert value '%s' for sensor '%s' (%s) to float.",
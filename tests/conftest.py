@@ -0,0 +1,73 @@
+"""Shared fixtures for the Open Inverter Gateway tests."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+
+class FakeResponse:
+    """Minimal aiohttp response stand-in serving JSON data (or a raw body) from read()."""
+
+    def __init__(self, data, status=200, body=None):
+        self._data = data
+        self.status = status
+        self._body = body
+
+    def raise_for_status(self):
+        pass
+
+    async def read(self):
+        if self._body is not None:
+            return self._body
+        return json.dumps(self._data).encode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+@pytest.fixture
+def mock_hass():
+    """Create a mock Home Assistant instance."""
+    hass = MagicMock(spec=HomeAssistant)
+    hass.data = {}
+    hass.bus = MagicMock()
+    hass.config_entries = MagicMock()
+    hass.config_entries.async_forward_entry_setups = AsyncMock()
+    return hass
+
+
+@pytest.fixture
+def mock_session():
+    """Mock aiohttp session."""
+    with patch("custom_components.openinverter.coordinator._async_create_session") as mock_ws:
+        session = MagicMock()
+        session.close = AsyncMock()
+        mock_ws.return_value = session
+        yield session
+
+
+@pytest.fixture
+def set_get_response(mock_session):
+    """Return a helper making the mocked session answer with the given JSON data (or raw body)."""
+
+    def _set_get_response(data, body=None):
+        # session.get() is used as an async context manager
+        mock_session.get = MagicMock(return_value=FakeResponse(data, body=body))
+
+    return _set_get_response
+
+
+@pytest.fixture
+def mock_flow_session():
+    """Mock the shared aiohttp session used by the config flow."""
+    with patch("custom_components.openinverter.config_flow.async_get_clientsession") as mock_get_session:
+        session = MagicMock()
+        # session.get() is used as an async context manager
+        session.get = MagicMock(return_value=FakeResponse({"Mac": "11:22:33:44:55:66"}))
+        mock_get_session.return_value = session
+        yield session
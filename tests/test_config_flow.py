@@ -0,0 +1,41 @@
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.const import CONF_IP_ADDRESS
+
+from custom_components.openinverter.config_flow import validate_input
+from custom_components.openinverter.const import DOMAIN
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "host", ["foo bar", "inverter.local\n", "a/b", "fe80::1", "inverter.local:99999", "inverter.local:0"]
+)
+async def test_validate_input_invalid_host(mock_hass, mock_flow_session, host):
+    """Test malformed hosts are rejected without a request."""
+    with pytest.raises(ValueError, match="invalid_host"):
+        await validate_input(mock_hass, {CONF_IP_ADDRESS: host})
+
+    mock_flow_session.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("host", ["192.168.1.100", "inverter.local", "192.168.1.100:8080", "inverter.local:65535"])
+async def test_validate_input_valid_host(mock_hass, mock_flow_session, host):
+    """Test IP addresses, hostnames and ip:port are accepted and queried."""
+    info = await validate_input(mock_hass, {CONF_IP_ADDRESS: host})
+
+    assert info == {"title": f"Open Inverter ({host})"}
+    mock_flow_session.get.assert_called_once_with(f"http://{host}/status")
+
+
+@pytest.mark.asyncio
+async def test_validate_input_uses_shared_session(mock_hass, mock_flow_session):
+    """Test validation never borrows the single-connection session of a running coordinator."""
+    coordinator = MagicMock(ip_address="192.168.1.100")
+    mock_hass.data[DOMAIN] = {"entry": coordinator}
+
+    await validate_input(mock_hass, {CONF_IP_ADDRESS: "192.168.1.100"})
+
+    mock_flow_session.get.assert_called_once_with("http://192.168.1.100/status")
+    coordinator.session.get.assert_not_called()
@@ -1,10 +1,11 @@
-from datetime import timedelta
+import asyncio
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from homeassistant.const import CONF_IP_ADDRESS, CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_IP_ADDRESS, CONF_SCAN_INTERVAL, EVENT_HOMEASSISTANT_CLOSE
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from custom_components.openinverter.coordinator import OpenInverterDataUpdateCoordinator
 
@@ -14,14 +15,6 @@ MOCK_CONFIG_DATA = {CONF_IP_ADDRESS: MOCK_IP}
 MOCK_OPTIONS_DATA = {CONF_SCAN_INTERVAL: 10}
 
 
-@pytest.fixture
-def mock_hass():
-    """Create a mock Home Assistant instance."""
-    hass = MagicMock(spec=HomeAssistant)
-    hass.data = {}
-    return hass
-
-
 @pytest.fixture
 def mock_config_entry():
     """Create a mock config entry."""
@@ -32,15 +25,6 @@ def mock_config_entry():
     return entry
 
 
-@pytest.fixture
-def mock_session():
-    """Mock aiohttp session."""
-    with patch("custom_components.openinverter.coordinator.async_get_clientsession") as mock_ws:
-        session = MagicMock()
-        mock_ws.return_value = session
-        yield session
-
-
 @pytest.fixture(autouse=True)
 def mock_store():
     """Mock the storage to prevent file access and config errors."""
@@ -48,9 +32,17 @@ def mock_store():
         store = MockStore.return_value
         store.async_load = AsyncMock(return_value=None)
         store.async_save = AsyncMock()
+        store.async_delay_save = MagicMock()
         yield MockStore
 
 
+@pytest.fixture(autouse=True)
+def no_jitter():
+    """Disable backoff jitter so intervals are deterministic."""
+    with patch("custom_components.openinverter.coordinator.random.uniform", return_value=0.0) as mock_uniform:
+        yield mock_uniform
+
+
 @pytest.mark.asyncio
 async def test_initial_interval(mock_hass, mock_config_entry, mock_session):
     """Test initial update interval is set correctly."""
@@ -86,38 +78,75 @@ async def test_exponential_backoff_on_timeout(mock_hass, mock_config_entry, mock
 async def test_backoff_cap(mock_hass, mock_config_entry, mock_session):
     """Test backoff doesn't exceed 5 minutes."""
     coordinator = OpenInverterDataUpdateCoordinator(mock_hass, mock_config_entry)
-    # Set interval close to max to test cap
-    coordinator.update_interval = timedelta(minutes=4)
+    # Simulate enough earlier failures to reach the cap
+    coordinator._failure_count = 4
 
     mock_session.get.side_effect = TimeoutError()
 
     with pytest.raises(UpdateFailed):
         await coordinator._async_update_data()
 
-    # Should be capped at 5 mins, not 8 mins
+    # Should be capped at 5 mins, not 10 * 2**5 seconds
     assert coordinator.update_interval == timedelta(minutes=5)
 
 
-class FakeResponse:
-    def __init__(self, data, status=200):
-        self._data = data
-        self.status = status
+@pytest.mark.asyncio
+async def test_backoff_jitter(mock_hass, mock_config_entry, mock_session, no_jitter):
+    """Test jitter is added on top of the backoff delay."""
+    coordinator = OpenInverterDataUpdateCoordinator(mock_hass, mock_config_entry)
+    no_jitter.return_value = 0.1
+
+    mock_session.get.side_effect = TimeoutError()
+
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
 
-    def raise_for_status(self):
-        pass
+    assert coordinator.update_interval == timedelta(seconds=22)
 
-    async def json(self):
-        return self._data
 
-    async def __aenter__(self):
-        return self
+@pytest.mark.asyncio
+async def test_unexpected_error_propagates(mock_hass, mock_config_entry, mock_session):
+    """Test errors outside the handled types skip the backoff and cache path."""
+    coordinator = OpenInverterDataUpdateCoordinator(mock_hass, mock_config_entry)
+    coordinator._last_valid_data = {"TodayGenerateEnergy": 4.2, "OutputPower": 1500}
+    coordinator._last_valid_time = dt_util.now()
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        pass
+    mock_session.get.side_effect = KeyError("boom")
+
+    with pytest.raises(KeyError):
+        await coordinator._async_update_data()
+
+    assert coordinator.update_interval == timedelta(seconds=10)
+    assert coordinator._failure_count == 0
+
+
+@pytest.mark.asyncio
+async def test_invalid_json_backs_off(mock_hass, mock_config_entry, set_get_response):
+    """Test a non-JSON body is treated as a failed fetch."""
+    coordinator = OpenInverterDataUpdateCoordinator(mock_hass, mock_config_entry)
+    set_get_response(None, body=b"<html>not json</html>")
+
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+    assert coordinator.update_interval == timedelta(seconds=20)
+    assert coordinator._failure_count == 1
 
 
 @pytest.mark.asyncio
-async def test_reset_on_success(mock_hass, mock_config_entry, mock_session):
+async def test_non_dict_json_uses_cache(mock_hass, mock_config_entry, set_get_response):
+    """Test a JSON body that is not an object falls back to the cache."""
+    coordinator = OpenInverterDataUpdateCoordinator(mock_hass, mock_config_entry)
+    coordinator._last_valid_data = {"TodayGenerateEnergy": 4.2, "OutputPower": 1500}
+    coordinator._last_valid_time = dt_util.now()
+    set_get_response([1, 2, 3])
+
+    assert await coordinator._async_update_data() == {"TodayGenerateEnergy": 4.2, "OutputPower": 0}
+    assert coordinator.update_interval == timedelta(seconds=20)
+
+
+@pytest.mark.asyncio
+async def test_reset_on_success(mock_hass, mock_config_entry, mock_session, set_get_response):
     """Test interval resets to base on success."""
     coordinator = OpenInverterDataUpdateCoordinator(mock_hass, mock_config_entry)
 
@@ -131,11 +160,7 @@ async def test_reset_on_success(mock_hass, mock_config_entry, mock_session):
     assert coordinator.update_interval == timedelta(seconds=20)
 
     # Simulate success
-    mock_session.get.side_effect = None
-    fake_response = FakeResponse({"Mac": "11:22:33:44:55:66"})
-
-    # session.get() updates return value to be awaitable
-    mock_session.get = AsyncMock(return_value=fake_response)
+    set_get_response({"Mac": "11:22:33:44:55:66"})
 
     await coordinator._async_update_data()
 
@@ -144,35 +169,152 @@ async def test_reset_on_success(mock_hass, mock_config_entry, mock_session):
 
 
 @pytest.mark.asyncio
-async def test_persistence_load_and_save(mock_hass, mock_config_entry, mock_session):
+async def test_persistence_load_and_save(mock_hass, mock_config_entry, set_get_response, mock_store):
     """Test data is loaded from and saved to storage."""
+    mock_store_instance = mock_store.return_value
+    # Setup async_load to return mocked data
+    mock_store_instance.async_load = AsyncMock(
+        return_value={"data": {"Mac": "AA:BB:CC:DD:EE:FF"}, "timestamp": "2023-10-27T10:00:00+00:00"}
+    )
 
-    # Mock Store
-    with patch("custom_components.openinverter.coordinator.Store") as MockStore:
-        mock_store_instance = MockStore.return_value
-        # Setup async_load to return mocked data
-        mock_store_instance.async_load = AsyncMock(
-            return_value={"data": {"Mac": "AA:BB:CC:DD:EE:FF"}, "timestamp": "2023-10-27T10:00:00+00:00"}
-        )
-        mock_store_instance.async_save = AsyncMock()
+    coordinator = OpenInverterDataUpdateCoordinator(mock_hass, mock_config_entry)
+
+    # Test loading
+    await coordinator.async_load_saved_data()
 
+    assert coordinator._last_valid_data == {"Mac": "AA:BB:CC:DD:EE:FF"}
+    assert str(coordinator._last_valid_time) == "2023-10-27 10:00:00+00:00"
+
+    # Test saving on successful update
+    set_get_response({"Mac": "11:22:33:44:55:66"})
+
+    await coordinator._async_update_data()
+
+    # Verify a delayed save was scheduled rather than an immediate write
+    mock_store_instance.async_save.assert_not_called()
+    mock_store_instance.async_delay_save.assert_called_once()
+    data_func, delay = mock_store_instance.async_delay_save.call_args[0]
+    assert delay == coordinator.SAVE_DELAY
+    save_call_args = data_func()
+    assert save_call_args["data"] == {"Mac": "11:22:33:44:55:66"}
+    assert "timestamp" in save_call_args
+
+    # Pending data is flushed on shutdown
+    with patch("homeassistant.helpers.update_coordinator.DataUpdateCoordinator.async_shutdown", AsyncMock()):
+        await coordinator.async_shutdown()
+    mock_store_instance.async_save.assert_called_once()
+    assert mock_store_instance.async_save.call_args[0][0]["data"] == {"Mac": "11:22:33:44:55:66"}
+
+
+@pytest.mark.asyncio
+async def test_same_day_failure_keeps_daily_sensors(mock_hass, mock_config_entry, mock_session):
+    """Test daily sensors and the device identity are cached and others zeroed on a same-day failure."""
+    coordinator = OpenInverterDataUpdateCoordinator(mock_hass, mock_config_entry)
+    coordinator._last_valid_data = {"TodayGenerateEnergy": 4.2, "OutputPower": 1500, "Mac": "AA:BB"}
+    coordinator._last_valid_time = dt_util.now()
+
+    mock_session.get.side_effect = TimeoutError()
+
+    data = await coordinator._async_update_data()
+
+    assert data == {"TodayGenerateEnergy": 4.2, "OutputPower": 0, "Mac": "AA:BB"}
+
+
+@pytest.mark.asyncio
+async def test_new_day_failure_zeroes_everything(mock_hass, mock_config_entry, mock_session):
+    """Test all but lifetime values are zeroed on a failure after midnight, following key set changes."""
+    coordinator = OpenInverterDataUpdateCoordinator(mock_hass, mock_config_entry)
+    coordinator._last_valid_data = {"TodayGenerateEnergy": 4.2, "OutputPower": 1500, "TotalGenerateEnergy": 812.5}
+    coordinator._last_valid_time = dt_util.now() - timedelta(days=1)
+
+    mock_session.get.side_effect = TimeoutError()
+
+    assert await coordinator._async_update_data() == {
+        "TodayGenerateEnergy": 0,
+        "OutputPower": 0,
+        "TotalGenerateEnergy": 812.5,
+    }
+
+    # A changed key set must not reuse the stale template
+    coordinator._last_valid_data = {"TodayGenerateEnergy": 4.2, "SOC": 80}
+    assert await coordinator._async_update_data() == {"TodayGenerateEnergy": 0, "SOC": 0}
+
+
+@pytest.mark.asyncio
+async def test_device_info_is_shared(mock_hass, mock_config_entry, mock_session):
+    """Test the device info is built from the data once and then reused."""
+    coordinator = OpenInverterDataUpdateCoordinator(mock_hass, mock_config_entry)
+    coordinator.data = {"Hostname": "growatt", "Mac": "AA:BB:CC:DD:EE:FF"}
+
+    device_info = coordinator.device_info
+
+    assert device_info["name"] == "growatt"
+    assert device_info["connections"] == {("mac", "AA:BB:CC:DD:EE:FF")}
+    assert device_info["configuration_url"] == f"http://{MOCK_IP}"
+    assert coordinator.device_info is device_info
+
+
+@pytest.mark.asyncio
+async def test_fallback_data_from_storage(mock_hass, mock_config_entry, mock_session, mock_store):
+    """Test restored data is only published with the cache rules applied."""
+    mock_store.return_value.async_load = AsyncMock(
+        return_value={
+            "data": {"TodayGenerateEnergy": 4.2, "OutputPower": 1500},
+            "timestamp": "2023-10-27T10:00:00+00:00",
+        }
+    )
+    coordinator = OpenInverterDataUpdateCoordinator(mock_hass, mock_config_entry)
+
+    assert coordinator.fallback_data(dt_util.now()) is None
+
+    await coordinator.async_load_saved_data()
+
+    # Same day keeps the daily counters, real-time values are zeroed
+    same_day = datetime(2023, 10, 27, 18, 0, tzinfo=UTC)
+    assert coordinator.fallback_data(same_day) == {"TodayGenerateEnergy": 4.2, "OutputPower": 0}
+    # A new day zeroes everything
+    next_day = datetime(2023, 10, 28, 8, 0, tzinfo=UTC)
+    assert coordinator.fallback_data(next_day) == {"TodayGenerateEnergy": 0, "OutputPower": 0}
+
+
+@pytest.mark.asyncio
+async def test_options_updates_are_debounced(mock_hass, mock_config_entry, mock_session):
+    """Test quick options updates apply once and shutdown cancels a pending apply."""
+    loop = asyncio.get_running_loop()
+    # Run the Debouncer's timer and jobs on the test loop
+    mock_hass.loop = loop
+    mock_hass.async_create_task = lambda target, *args, **kwargs: loop.create_task(target)
+    mock_hass.async_run_hass_job = lambda job, *args, **kwargs: loop.create_task(job.target(*args))
+
+    with (
+        patch("custom_components.openinverter.coordinator.OPTIONS_UPDATE_COOLDOWN", 0.01),
+        patch.object(OpenInverterDataUpdateCoordinator, "_apply_options", AsyncMock()) as mock_apply,
+    ):
         coordinator = OpenInverterDataUpdateCoordinator(mock_hass, mock_config_entry)
 
-        # Test loading
-        await coordinator.async_load_saved_data()
+        for _ in range(3):
+            await coordinator._handle_options_update(mock_hass, mock_config_entry)
+        mock_apply.assert_not_awaited()
 
-        assert coordinator._last_valid_data == {"Mac": "AA:BB:CC:DD:EE:FF"}
-        assert str(coordinator._last_valid_time) == "2023-10-27 10:00:00+00:00"
+        await asyncio.sleep(0.05)
+        mock_apply.assert_awaited_once()
 
-        # Test saving on successful update
-        mock_session.get.side_effect = None
-        fake_response = FakeResponse({"Mac": "11:22:33:44:55:66"})
-        mock_session.get = AsyncMock(return_value=fake_response)
+        # A call still pending at shutdown is dropped
+        await asyncio.sleep(0.05)
+        await coordinator._handle_options_update(mock_hass, mock_config_entry)
+        with patch("homeassistant.helpers.update_coordinator.DataUpdateCoordinator.async_shutdown", AsyncMock()):
+            await coordinator.async_shutdown()
+        await asyncio.sleep(0.05)
+        mock_apply.assert_awaited_once()
 
-        await coordinator._async_update_data()
 
-        # Verify async_save was called
-        mock_store_instance.async_save.assert_called_once()
-        save_call_args = mock_store_instance.async_save.call_args[0][0]
-        assert save_call_args["data"] == {"Mac": "11:22:33:44:55:66"}
-        assert "timestamp" in save_call_args
+@pytest.mark.asyncio
+async def test_session_closed_on_homeassistant_close(mock_hass, mock_config_entry, mock_session):
+    """Test the session is closed when Home Assistant stops, and the listener is released on unload."""
+    coordinator = OpenInverterDataUpdateCoordinator(mock_hass, mock_config_entry)
+
+    mock_hass.bus.async_listen_once.assert_called_once_with(EVENT_HOMEASSISTANT_CLOSE, coordinator._async_close_session)
+    mock_config_entry.async_on_unload.assert_called_once_with(mock_hass.bus.async_listen_once.return_value)
+
+    await coordinator._async_close_session(MagicMock())
+    mock_session.close.assert_awaited_once()
@@ -0,0 +1,55 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.const import CONF_IP_ADDRESS, CONF_SCAN_INTERVAL
+from homeassistant.util import dt as dt_util
+
+from custom_components.openinverter import async_setup_entry
+from custom_components.openinverter.const import DOMAIN, PLATFORMS
+
+MOCK_IP = "192.168.1.100"
+
+
+@pytest.fixture
+def mock_config_entry():
+    """Create a mock config entry."""
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    entry.data = {CONF_IP_ADDRESS: MOCK_IP}
+    entry.options = {CONF_SCAN_INTERVAL: 10}
+    entry.title = "Test Inverter"
+    return entry
+
+
+@pytest.mark.asyncio
+async def test_setup_seeds_from_storage(mock_hass, mock_config_entry, mock_session):
+    """Test setup publishes the persisted data without waiting on the gateway."""
+    stored = {
+        "Hostname": "growatt",
+        "Mac": "AA:BB:CC:DD:EE:FF",
+        "TodayGenerateEnergy": 4.2,
+        "TotalGenerateEnergy": 812.5,
+        "OutputPower": 1500,
+    }
+    with patch("custom_components.openinverter.coordinator.Store") as mock_store:
+        mock_store.return_value.async_load = AsyncMock(
+            return_value={"data": stored, "timestamp": dt_util.now().isoformat()}
+        )
+        assert await async_setup_entry(mock_hass, mock_config_entry)
+
+    coordinator = mock_hass.data[DOMAIN]["test_entry"]
+    assert coordinator.data == {
+        "Hostname": "growatt",
+        "Mac": "AA:BB:CC:DD:EE:FF",
+        "TodayGenerateEnergy": 4.2,
+        "TotalGenerateEnergy": 812.5,
+        "OutputPower": 0,
+    }
+    assert coordinator.device_info["name"] == "growatt"
+    assert coordinator.device_info["connections"] == {("mac", "AA:BB:CC:DD:EE:FF")}
+    mock_session.get.assert_not_called()
+    mock_hass.config_entries.async_forward_entry_setups.assert_awaited_once_with(mock_config_entry, PLATFORMS)
+
+    # The live fetch is left to a background task
+    mock_config_entry.async_create_background_task.assert_called_once()
+    mock_config_entry.async_create_background_task.call_args[0][1].close()
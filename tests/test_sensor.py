@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.helpers.entity import DeviceInfo
+
+from custom_components.openinverter.const import DOMAIN
+from custom_components.openinverter.sensor import SENSOR_DESCRIPTIONS, OpenInverterSensor, async_setup_entry
+
+
+@pytest.fixture
+def mock_coordinator():
+    """Create a mock coordinator serving the given data."""
+    coordinator = MagicMock()
+    coordinator.ip_address = "192.168.1.100"
+    coordinator.data = {}
+    return coordinator
+
+
+@pytest.fixture
+def mock_config_entry():
+    """Create a mock config entry."""
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    return entry
+
+
+def _sensor(coordinator, config_entry, key):
+    device_info = DeviceInfo(identifiers={(DOMAIN, "test_entry")})
+    return OpenInverterSensor(coordinator, config_entry, SENSOR_DESCRIPTIONS[key], device_info)
+
+
+@pytest.mark.parametrize(
+    ("key", "raw", "expected"),
+    [
+        ("OutputPower", 1500, 1500),
+        ("OutputPower", 1500.5, 1500.5),
+        ("OutputPower", "1500.5", 1500.5),
+        ("OutputPower", "n/a", None),
+        ("InverterStatus", "1", "1"),
+        ("InverterStatus", 1, 1),
+        ("OutputPower", None, None),
+    ],
+)
+def test_native_value(mock_coordinator, mock_config_entry, key, raw, expected):
+    """Test numbers pass through, numeric strings convert and text sensors are left alone."""
+    mock_coordinator.data = {key: raw}
+
+    value = _sensor(mock_coordinator, mock_config_entry, key).native_value
+
+    assert value == expected
+    assert type(value) is type(expected)
+
+
+def test_native_value_missing(mock_coordinator, mock_config_entry):
+    """Test a missing key or missing data gives no value."""
+    sensor = _sensor(mock_coordinator, mock_config_entry, "OutputPower")
+
+    mock_coordinator.data = {"InputPower": 1500}
+    assert sensor.native_value is None
+
+    mock_coordinator.data = None
+    assert sensor.native_value is None
+
+
+@pytest.mark.asyncio
+async def test_setup_entry_adds_reported_sensors(mock_coordinator, mock_config_entry):
+    """Test only reported keys become sensors, in definition order, sharing one DeviceInfo."""
+    mock_coordinator.data = {"OutputPower": 1500, "UnknownKey": 1, "InputPower": 1600, "InverterStatus": 1}
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"test_entry": mock_coordinator}}
+    async_add_entities = MagicMock()
+
+    await async_setup_entry(hass, mock_config_entry, async_add_entities)
+
+    entities = async_add_entities.call_args[0][0]
+    assert [entity.entity_description.key for entity in entities] == ["InverterStatus", "InputPower", "OutputPower"]
+    assert all(entity.device_info is mock_coordinator.device_info for entity in entities)
+    assert entities[0].unique_id == "test_entry_InverterStatus"